@@ -0,0 +1,155 @@
+import hashlib
+
+import numpy as np
+from numba import njit, prange
+
+
+def source_hash() -> int:
+    """
+    Hash of this module's source, used to detect a stale ahead-of-time build
+
+    :return: First 60 bits of the SHA-1 of this file
+    """
+    with open(__file__, "rb") as f:
+        return int(hashlib.sha1(f.read()).hexdigest()[:15], 16)
+
+
+@njit(cache=True, fastmath=True)
+def _step(close, has_bar, signals, cash, shares):
+    """
+    Trade every symbol on a single bar
+
+    :param close: float32 last known close prices with shape (n_symbols,)
+    :param has_bar: Mask of the symbols that have a bar to trade on
+    :param signals: Trading signals (-1, 0, 1) of the bar with shape (n_symbols,)
+    :param cash: Cash held for each symbol, updated in place
+    :param shares: Shares held for each symbol, updated in place
+    :return: Portfolio value at the end of the bar
+    """
+    value = 0.0
+    for j in range(close.shape[0]):
+        p = close[j]
+
+        # Only trade on days with a bar, but value holdings every day
+        if has_bar[j]:
+            # Buy
+            if signals[j] == 1 and cash[j] > 0:
+                q = cash[j] // p
+                shares[j] += q
+                cash[j] -= q * p
+            # Sell
+            elif signals[j] == -1 and shares[j] > 0:
+                cash[j] += shares[j] * p
+                shares[j] = 0.0
+
+        value += shares[j] * p
+
+    return value + cash.sum()
+
+
+@njit(cache=True, fastmath=True)
+def simulate(
+    close,
+    has_bar,
+    signals,
+    cash,
+    shares,
+    strat_vals,
+    spy_close,
+    spy_shares,
+    spy_cash,
+    spy_vals,
+):
+    """
+    Simulate the trading strategy bar by bar
+
+    cash and shares are updated in place, strat_vals and spy_vals are filled
+    with the portfolio value at the end of each bar. Prices are float32, cash,
+    shares and values float64.
+
+    :param close: float32 last known close prices with shape (n_days, n_symbols)
+    :param has_bar: Mask of the days each symbol has a bar to trade on
+    :param signals: Trading signals (-1, 0, 1) with shape (n_days, n_symbols)
+    :param cash: Cash held for each symbol
+    :param shares: Shares held for each symbol
+    :param strat_vals: Output array for the strategy value of each bar
+    :param spy_close: float32 SPY close prices with shape (n_days,)
+    :param spy_shares: SPY shares held
+    :param spy_cash: SPY cash held
+    :param spy_vals: Output array for the SPY value of each bar
+    """
+    for t in range(close.shape[0]):
+        strat_vals[t] = _step(close[t], has_bar[t], signals[t], cash, shares)
+        spy_vals[t] = spy_shares * spy_close[t] + spy_cash
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def simulate_grid(close, has_bar, signals, cash_per_stock, out):
+    """
+    Simulate several variants of a trading strategy, in parallel
+
+    Every variant starts with cash_per_stock for each symbol and trades on its
+    own slice of signals along the last axis.
+
+    :param close: Last known close prices with shape (n_days, n_symbols)
+    :param has_bar: Mask of the days each symbol has a bar to trade on
+    :param signals: Trading signals (-1, 0, 1) with shape (n_days, n_symbols, K)
+    :param cash_per_stock: Starting cash for each symbol
+    :param out: Output array for the strategy values with shape (K, n_days)
+    """
+    T, N = close.shape
+    for k in prange(signals.shape[2]):
+        cash = np.full(N, cash_per_stock)
+        shares = np.zeros(N)
+        for t in range(T):
+            out[k, t] = _step(close[t], has_bar[t], signals[t, :, k], cash, shares)
+
+
+@njit(parallel=True, cache=True)
+def sma_signals(close, short, long, out):
+    """
+    Compute simple moving average crossover signals for every bar
+
+    Each symbol is handled independently, in parallel, with running sums over
+    the short and long windows. Missing prices are left out of the means, like
+    pandas' rolling(min_periods=1).
+
+    :param close: Close prices with shape (n_days, n_symbols)
+    :param short: Short moving average window
+    :param long: Long moving average window
+    :param out: Output array for the signals (-1, 1) with the shape of close
+    """
+    T, N = close.shape
+    for j in prange(N):
+        short_sum = 0.0
+        short_count = 0
+        long_sum = 0.0
+        long_count = 0
+        for t in range(T):
+            p = close[t, j]
+            if not np.isnan(p):
+                short_sum += p
+                short_count += 1
+                long_sum += p
+                long_count += 1
+
+            # Drop the prices that have left each window
+            if t >= short:
+                p = close[t - short, j]
+                if not np.isnan(p):
+                    short_sum -= p
+                    short_count -= 1
+            if t >= long:
+                p = close[t - long, j]
+                if not np.isnan(p):
+                    long_sum -= p
+                    long_count -= 1
+
+            if (
+                short_count > 0
+                and long_count > 0
+                and short_sum / short_count > long_sum / long_count
+            ):
+                out[t, j] = 1
+            else:
+                out[t, j] = -1
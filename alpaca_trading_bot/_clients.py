@@ -0,0 +1,35 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def data_client(api_key: str, api_secret: str):
+    """
+    Get the shared historical data client for a set of credentials
+
+    Reusing one client keeps its HTTP session, and so its open connections,
+    alive across every HistoricalData instance.
+
+    :param api_key: Alpaca API key
+    :param api_secret: Alpaca secret
+    :return: StockHistoricalDataClient
+    """
+    from alpaca.data import StockHistoricalDataClient
+
+    return StockHistoricalDataClient(api_key=api_key, secret_key=api_secret)
+
+
+@lru_cache(maxsize=None)
+def trading_client(api_key: str, api_secret: str, paper: bool = False):
+    """
+    Get the shared trading client for a set of credentials
+
+    :param api_key: Alpaca API key
+    :param api_secret: Alpaca secret
+    :param paper: Paper trading mode, leave False to use the SDK's default
+    :return: TradingClient
+    """
+    from alpaca.trading.client import TradingClient
+
+    if paper:
+        return TradingClient(api_key=api_key, secret_key=api_secret, paper=True)
+    return TradingClient(api_key=api_key, secret_key=api_secret)
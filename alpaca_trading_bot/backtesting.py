@@ -1,15 +1,27 @@
 import datetime
 import logging
 
-from alpaca.data.timeframe import TimeFrame
-from collections import defaultdict
+import numpy as np
 import pandas as pd
 
+from _bt_kernel import simulate, simulate_grid, source_hash
 from historical_data import HistoricalData
 from models import Model
 
 log = logging.getLogger(__name__)
 
+# Prefer the ahead-of-time compiled kernel from build_kernels.py, as long as it
+# was built from the current _bt_kernel.py
+try:
+    import _bt_kernel_aot
+except ImportError:
+    pass
+else:
+    if _bt_kernel_aot.source_hash() == source_hash():
+        simulate = _bt_kernel_aot.simulate
+    else:
+        log.warning("_bt_kernel_aot is out of date, run build_kernels.py again")
+
 
 class BackTester:
     def __init__(
@@ -49,101 +61,187 @@ class BackTester:
 
         self.strategy = strategy
         self.historical_data = HistoricalData(api_key, api_secret)
-        self.portfolio = defaultdict(lambda: {"shares": 0, "cash": 0})
+        # Portfolio state per symbol, indexed by position in self.symbols
+        self.cash = np.zeros(len(symbols))
+        self.shares = np.zeros(len(symbols))
         self.spy_portfolio = {"cash": starting_money, "shares": 0}
-        self.results = {"strategy_value": [], "spy_value": []}
+        self.results = {"strategy_value": np.empty(0), "spy_value": np.empty(0)}
 
     def run(self):
         """
         Run the backtest
         """
         # Distribute starting money evenly among stocks
-        cash_per_stock = self.starting_money / len(self.symbols)
-        self.portfolio = {
-            symbol: {"shares": 0, "cash": cash_per_stock} for symbol in self.symbols
+        self.cash = np.full(len(self.symbols), self.starting_money / len(self.symbols))
+        self.shares = np.zeros(len(self.symbols))
+        log.info(f"Initial Cash: {dict(zip(self.symbols, self.cash.tolist()))}")
+
+        date_range, bar_close, close_arr, has_bar, spy_data = self._load_prices()
+        spy_close = (
+            spy_data["close"]
+            .reindex(date_range)
+            .ffill()
+            .bfill()
+            .to_numpy(dtype=np.float32)
+        )
+
+        # Track SPY investment (Buy once at the beginning and hold)
+        spy_ts = spy_data.index.values
+        spy_closes = spy_data["close"].to_numpy(dtype=np.float32)
+        i0 = np.searchsorted(spy_ts, np.datetime64(self.start_date))
+        if i0 == len(spy_ts):
+            raise ValueError("No SPY data found")
+        initial_spy_close = float(spy_closes[i0])
+        self.spy_portfolio["shares"] = self.spy_portfolio["cash"] // initial_spy_close
+        self.spy_portfolio["cash"] -= self.spy_portfolio["shares"] * initial_spy_close
+
+        signals = self._signals(self.strategy, bar_close)
+
+        self.results = {
+            "strategy_value": np.empty(len(date_range)),
+            "spy_value": np.empty(len(date_range)),
         }
-        log.info(f"Initial Portfolio: {self.portfolio}")
 
-        # Get data for the entire period for all symbols
+        # Run the backtest
+        simulate(
+            close_arr,
+            has_bar,
+            signals,
+            self.cash,
+            self.shares,
+            self.results["strategy_value"],
+            spy_close,
+            self.spy_portfolio["shares"],
+            self.spy_portfolio["cash"],
+            self.results["spy_value"],
+        )
+
+        # Only format the per-bar values when debug logging is on
+        if log.isEnabledFor(logging.DEBUG):
+            for date, strategy_value, spy_value in zip(
+                date_range, self.results["strategy_value"], self.results["spy_value"]
+            ):
+                log.debug(f"Portfolio Value on {date}: ${strategy_value:.2f}")
+                log.debug(f"SPY Portfolio Value on {date}: ${spy_value:.2f}")
+
+        self._report()
+
+    def run_grid(self, param_list: list) -> np.ndarray:
+        """
+        Backtest several parameter sets of the strategy in a single pass
+
+        The data is fetched once and every variant is simulated over the same
+        close matrix. Each variant is built by calling the strategy's class with
+        one entry of param_list as keyword arguments.
+
+        :param param_list: List of keyword argument dicts for the strategy
+        :return: Strategy values with shape (len(param_list), n_days)
+        """
+        date_range, bar_close, close_arr, has_bar, _ = self._load_prices()
+
+        # Stack the signals of every variant into a (n_days, n_symbols, K) tensor
+        signals = np.empty(close_arr.shape + (len(param_list),), dtype=np.int8)
+        for k, params in enumerate(param_list):
+            strategy = type(self.strategy)(**params)
+            signals[:, :, k] = self._signals(strategy, bar_close)
+
+        values = np.empty((len(param_list), len(date_range)))
+        simulate_grid(
+            close_arr,
+            has_bar,
+            signals,
+            self.starting_money / len(self.symbols),
+            values,
+        )
+
+        for params, strategy_values in zip(param_list, values):
+            change = (strategy_values[-1] - self.starting_money) / self.starting_money
+            log.info(f"{params}: Final Value ${strategy_values[-1]:.2f} ({change:.2%})")
+
+        return values
+
+    def _load_prices(self):
+        """
+        Get the close prices of the symbols and SPY for the backtest period
+
+        :return: Tuple of the session dates, the dense (n_days, n_symbols) close
+            matrix with NaN on days without a bar, the same matrix forward
+            filled for valuation, the mask of days with a bar and the SPY bars
+        """
+        import pandas_market_calendars as mcal
+
+        # Get data for the entire period for all symbols and SPY in one request
         data = self.historical_data.get_data(
-            symbols=self.symbols,
+            symbols=list(dict.fromkeys(self.symbols + ["SPY"])),
             start=self.start_date,
             end=self.end_date,
-            timeframe=TimeFrame.Day,
+            # Passed as a string so a cache hit doesn't need the Alpaca SDK
+            timeframe="1Day",
         )
-        log.debug(f"Data: \n{data.head()}\n")
+        log.debug("Data: \n%s\n", data.head())
+        # An empty response has no (symbol, timestamp) MultiIndex to work with
         if data.empty:
             raise ValueError("No data found")
 
-        # Convert date range to UTC
-        date_range = pd.date_range(
-            self.start_date, self.end_date, freq="B"
-        ).tz_localize("UTC")
-
-        # Get SPY data for the whole period once at the beginning
-        spy_data = self.historical_data.get_data(
-            ["SPY"], self.start_date, self.end_date, TimeFrame.Day
+        # Daily bars are stamped at midnight New York time, so key them on the
+        # session date instead of a fixed UTC hour that shifts with DST
+        sessions = (
+            data.index.get_level_values(1)
+            .tz_convert("America/New_York")
+            .normalize()
+            .tz_localize(None)
+        )
+        data.index = pd.MultiIndex.from_arrays(
+            [data.index.get_level_values(0), sessions], names=data.index.names
         )
 
-        # Track SPY investment (Buy once at the beginning and hold)
-        initial_spy_close = None
-        i = 0
-        while initial_spy_close is None and i < len(spy_data):
-            try:
-                initial_spy_close = spy_data.loc[
-                    ("SPY", date_range[i].replace(hour=5))
-                ]["close"]
-            except Exception:
-                i += 1
-                if i == len(spy_data):
-                    raise ValueError("No SPY data found")
-        self.spy_portfolio["shares"] = self.spy_portfolio["cash"] // initial_spy_close
-        self.spy_portfolio["cash"] -= self.spy_portfolio["shares"] * initial_spy_close
+        # Sort once so the symbol level can be sliced without a full scan
+        data = data.sort_index()
+        fetched_symbols = data.index.get_level_values(0)
+        if "SPY" not in fetched_symbols:
+            raise ValueError("No SPY data found")
+        spy_data = data.xs("SPY", level=0)
+        data = data[fetched_symbols.isin(self.symbols)]
+        data.index = data.index.remove_unused_levels()
+        if data.empty:
+            raise ValueError("No data found")
 
-        # Run the backtest
-        for date in date_range:
-            date = date.replace(hour=5, minute=0, second=0, microsecond=0)
-            for symbol in self.symbols:
-                if (symbol, date) not in data.index:
-                    continue  # Skip days with no trading data for this symbol
-
-                stock_data = data.loc[(symbol, date)]
-
-                # Get prediction from the strategy
-                decision = self.strategy.predict(data.loc[symbol])
-
-                # Buy
-                if decision == 1 and self.portfolio[symbol]["cash"] > 0:
-                    price = stock_data["close"]
-                    shares_to_buy = self.portfolio[symbol]["cash"] // price
-                    self.portfolio[symbol]["shares"] += shares_to_buy
-                    self.portfolio[symbol]["cash"] -= shares_to_buy * price
-                # Sell
-                elif decision == -1 and self.portfolio[symbol]["shares"] > 0:
-                    price = stock_data["close"]
-                    self.portfolio[symbol]["cash"] += (
-                        self.portfolio[symbol]["shares"] * price
-                    )
-                    self.portfolio[symbol]["shares"] = 0
-
-                # Calculate current portfolio values
-                strategy_value = sum(
-                    self.portfolio[symbol]["shares"] * data.loc[(symbol, date)]["close"]
-                    for symbol in self.symbols
-                    if (symbol, date) in data.index
-                ) + sum(self.portfolio[symbol]["cash"] for symbol in self.symbols)
-
-                spy_value = (
-                    self.spy_portfolio["shares"] * spy_data.loc[("SPY", date)]["close"]
-                    + self.spy_portfolio["cash"]
-                )
-
-                self.results["strategy_value"].append(strategy_value)
-                self.results["spy_value"].append(spy_value)
-                log.debug(f"Portfolio Value on {date}: ${strategy_value:.2f}")
-                log.debug(f"SPY Portfolio Value on {date}: ${spy_value:.2f}")
+        # Use the NYSE trading session dates, so no iteration is spent on
+        # market holidays
+        nyse = mcal.get_calendar("NYSE")
+        date_range = nyse.schedule(self.start_date, self.end_date).index
+        if date_range.empty:
+            raise ValueError("No trading sessions found")
+
+        # Pivot the closes once into a dense (n_days, n_symbols) matrix so the
+        # backtest loop can index by integer row/column instead of MultiIndex
+        closes = (
+            data["close"]
+            .unstack(level=0)
+            .reindex(index=date_range, columns=self.symbols)
+        )
+        # Only days with an actual bar are traded on
+        has_bar = closes.notna().to_numpy()
+        # float32 is plenty for prices and halves the memory traffic of the
+        # kernels, which keep their cash and value accumulators in float64
+        bar_close = closes.to_numpy(dtype=np.float32)
+        # Holdings are valued at the last known close, no shares are held
+        # before a symbol's first bar
+        close_arr = closes.ffill().fillna(0.0).to_numpy(dtype=np.float32)
+
+        return date_range, bar_close, close_arr, has_bar, spy_data
+
+    @staticmethod
+    def _signals(strategy: Model, close_arr: np.ndarray):
+        """
+        Compute the strategy's trading signal for every bar
 
-        self._report()
+        :param strategy: Trading strategy (Model)
+        :param close_arr: Close prices with shape (n_days, n_symbols), NaN
+            where a symbol has no bar
+        :return: int8 signals (-1, 0, 1) with shape (n_days, n_symbols)
+        """
+        return strategy.precompute(close_arr).astype(np.int8, copy=False)
 
     def _report(self):
         """
@@ -1,11 +1,20 @@
+from __future__ import annotations
+
 import logging
 import os
+from typing import TYPE_CHECKING
 
-from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import MarketOrderRequest, GetAssetsRequest
-from alpaca.trading.enums import TimeInForce, AssetClass, AssetStatus, AssetExchange
 from dotenv import load_dotenv
 
+try:
+    from ._clients import trading_client
+except ImportError:
+    from _clients import trading_client
+
+# The Alpaca SDK is slow to import, so it is only imported where it is used
+if TYPE_CHECKING:
+    from alpaca.trading.enums import TimeInForce
+
 log = logging.getLogger(__name__)
 
 
@@ -20,12 +29,7 @@ class Broker:
         """
         Initialize the broker
         """
-        if paper:
-            self.client = TradingClient(
-                api_key=api_key, secret_key=api_secret, paper=True
-            )
-        else:
-            self.client = TradingClient(api_key=api_key, secret_key=api_secret)
+        self.client = trading_client(api_key, api_secret, paper)
         self.dry_run = dry_run
 
     def trade(
@@ -40,6 +44,8 @@ class Broker:
         :param time_in_force: Day or GTC
         :return: True if successful, False otherwise
         """
+        from alpaca.trading.requests import MarketOrderRequest
+
         log.info(f"Making trade: {side} {qty} {symbol} ({time_in_force})")
         market_order = MarketOrderRequest(
             symbol=symbol, qty=qty, side=side, time_in_force=time_in_force
@@ -63,6 +69,9 @@ class Broker:
 
         :return: List of assets
         """
+        from alpaca.trading.enums import AssetClass, AssetExchange, AssetStatus
+        from alpaca.trading.requests import GetAssetsRequest
+
         search_params = GetAssetsRequest(
             asset_class=AssetClass.US_EQUITY,
             status=AssetStatus.ACTIVE,
@@ -80,6 +89,8 @@ class Broker:
 
 
 if __name__ == "__main__":
+    from alpaca.trading.enums import TimeInForce
+
     # Set up logging
     logging.basicConfig(level=logging.INFO)
 
@@ -0,0 +1,51 @@
+import logging
+import os
+
+from numba.pycc import CC
+
+from _bt_kernel import simulate, source_hash
+
+log = logging.getLogger(__name__)
+
+# Argument types of the arrays BackTester.run passes to the simulation kernel
+SIMULATE_SIGNATURE = (
+    "void(f4[:, :], b1[:, :], i1[:, :], f8[:], f8[:], f8[:], f4[:], f8, f8, f8[:])"
+)
+
+
+def build(output_dir: str):
+    """
+    Compile the simulation kernel ahead of time into the _bt_kernel_aot module
+
+    The module also exports the source_hash() of _bt_kernel.py it was built
+    from. BackTester only uses the compiled simulate() while that hash matches
+    the current source, so edits to _bt_kernel.py fall back to the JIT kernel
+    until this is run again. This skips the JIT warm-up of simulate() on the
+    first run in a fresh environment; sma_signals and simulate_grid are still
+    compiled on first use.
+
+    numba.pycc is pending deprecation in Numba and prints a
+    NumbaPendingDeprecationWarning when used.
+
+    :param output_dir: Directory to write the extension module to
+    """
+    cc = CC("_bt_kernel_aot")
+    cc.output_dir = output_dir
+    cc.export("simulate", SIMULATE_SIGNATURE)(simulate.py_func)
+
+    built_hash = source_hash()
+
+    def built_source_hash():
+        return built_hash
+
+    cc.export("source_hash", "i8()")(built_source_hash)
+
+    log.info(f"Compiling _bt_kernel_aot into {output_dir}")
+    cc.compile()
+
+
+if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(level=logging.INFO)
+
+    build(os.path.dirname(os.path.abspath(__file__)))
@@ -1,12 +1,24 @@
+from __future__ import annotations
+
 import datetime
+import hashlib
 import logging
 import os
+import re
+from typing import TYPE_CHECKING
 
-from alpaca.data import StockHistoricalDataClient, StockBarsRequest
-from alpaca.data.timeframe import TimeFrame
 from dotenv import load_dotenv
 import pandas as pd
 
+try:
+    from ._clients import data_client
+except ImportError:
+    from _clients import data_client
+
+# The Alpaca SDK is slow to import, so it is only imported where it is used
+if TYPE_CHECKING:
+    from alpaca.data.timeframe import TimeFrame
+
 log = logging.getLogger(__name__)
 
 
@@ -16,33 +28,85 @@ class HistoricalData:
 
     :param api_key: Alpaca API key
     :param api_secret: Alpaca secret
+    :param cache_dir: Directory for cached responses, None to disable the disk cache
     """
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(
+        self, api_key: str, api_secret: str, cache_dir: str | None = ".hd_cache"
+    ):
         """
         Initialize the historical data client
 
         :param api_key: Alpaca API key
         :param api_secret: Alpaca secret
+        :param cache_dir: Directory for cached responses, None to disable the disk cache
         """
-        self.client = StockHistoricalDataClient(api_key=api_key, secret_key=api_secret)
+        self._api_key = api_key
+        self._api_secret = api_secret
+        self.cache_dir = cache_dir
+        self._memory_cache = {}
+
+    @property
+    def client(self):
+        """
+        Alpaca data client, created on first use so cache hits never load the SDK
+        """
+        return data_client(self._api_key, self._api_secret)
 
     def get_data(
         self,
         symbols: list,
         start: datetime.datetime,
         end: datetime.datetime,
-        timeframe: TimeFrame,
+        timeframe: TimeFrame | str,
     ) -> pd.DataFrame:
         """
         Get historical data for a list of symbols
 
+        Responses are cached in memory and as parquet files in cache_dir, keyed
+        by the request parameters, so repeated requests don't hit the API.
+        Only non-empty responses for requests ending more than a day ago are
+        cached, since later bars may still be incomplete and an empty reply may
+        be transient. Delete the cache directory to force a refetch.
+
         :param symbols: List of symbols
         :param start: Start date
         :param end: End date
-        :param timeframe: Timeframe
+        :param timeframe: Timeframe, or its string form such as "1Day"
 
         :return: DataFrame with historical data
         """
+        key = (
+            tuple(sorted(symbols)),
+            start.isoformat(),
+            end.isoformat(),
+            str(timeframe),
+        )
+        now = datetime.datetime.now(end.tzinfo)
+        cacheable = end < now - datetime.timedelta(days=1)
+        if cacheable and key in self._memory_cache:
+            log.debug(f"Using in-memory cached data for {symbols}")
+            return self._memory_cache[key].copy()
+
+        path = None
+        if cacheable and self.cache_dir is not None:
+            digest = hashlib.sha1(repr(key).encode()).hexdigest()
+            path = os.path.join(self.cache_dir, f"{digest}.parquet")
+            if os.path.exists(path):
+                log.info(f"Loading cached historical data for {symbols} from {path}")
+                df = pd.read_parquet(path)
+                self._memory_cache[key] = df
+                return df.copy()
+
+        from alpaca.data import StockBarsRequest
+        from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
+
+        if isinstance(timeframe, str):
+            # Same format as str(TimeFrame), so both share cache entries
+            match = re.fullmatch(r"(\d+)(\D+)", timeframe)
+            if match is None:
+                raise ValueError(f"Invalid timeframe: {timeframe}")
+            timeframe = TimeFrame(int(match[1]), TimeFrameUnit(match[2]))
+
         log.info(
             f"Getting historical data for {symbols} from {start} to {end} with timeframe {timeframe}"
         )
@@ -51,9 +115,21 @@ class HistoricalData:
         )
 
         response = self.client.get_stock_bars(request)
-        return response.df
+        df = response.df
+        if df.empty:
+            log.warning(f"No historical data returned for {symbols}, not caching")
+            return df
+
+        if path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_parquet(path)
+        if cacheable:
+            self._memory_cache[key] = df
+        return df.copy()
 
 if __name__ == "__main__":
+    from alpaca.data.timeframe import TimeFrame
+
     # Set up logging
     logging.basicConfig(level=logging.INFO)
     
@@ -4,6 +4,7 @@ import os
 import random
 
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 
 
@@ -18,14 +19,37 @@ class Model:
         """
         pass
 
-    def predict(self) -> int:
+    def predict(self, data: pd.DataFrame | None = None) -> int:
         """
         Make a prediction
 
+        :param data: Data to use for prediction
+
         :return: Prediction (-1, 0, 1)
         """
         return random.randint(-1, 1)
 
+    def precompute(self, close_matrix: np.ndarray) -> np.ndarray:
+        """
+        Make predictions for every bar at once
+
+        By default predict() is called for every bar with the closes up to and
+        including that bar. Subclasses can override this with a faster version.
+
+        :param close_matrix: Close prices with shape (n_days, n_symbols), NaN
+            where a symbol has no bar
+
+        :return: Predictions (-1, 0, 1) with shape (n_days, n_symbols)
+        """
+        signals = np.zeros(close_matrix.shape, dtype=np.int8)
+        for j in range(close_matrix.shape[1]):
+            closes = close_matrix[:, j]
+            bars = np.flatnonzero(~np.isnan(closes))
+            for n, t in enumerate(bars):
+                history = pd.DataFrame({"close": closes[bars[: n + 1]]})
+                signals[t, j] = self.predict(history)
+        return signals
+
 
 class SimpleMovingAverage(Model):
     """
@@ -50,25 +74,44 @@ class SimpleMovingAverage(Model):
 
         :return: Prediction (-1, 0, 1)
         """
-        data = data.sort_index()
-
-        # Calculate short and long moving averages
-        data["short_mavg"] = (
-            data["close"].rolling(window=self.short_window, min_periods=1).mean()
-        )
-        data["long_mavg"] = (
-            data["close"].rolling(window=self.long_window, min_periods=1).mean()
-        )
+        # Only the last value of each moving average is needed, so only the
+        # last window of prices has to be rolled over
+        close = data["close"].sort_index()
+        close = close.iloc[-max(self.short_window, self.long_window) :]
 
-        # Get the last available short and long moving average values
-        short_mavg = data["short_mavg"].iloc[-1]
-        long_mavg = data["long_mavg"].iloc[-1]
+        # Get the last short and long moving average values
+        short_mavg = close.rolling(window=self.short_window, min_periods=1).mean()
+        long_mavg = close.rolling(window=self.long_window, min_periods=1).mean()
+        short_mavg = short_mavg.iloc[-1]
+        long_mavg = long_mavg.iloc[-1]
 
         # Generate trading signal
         signal = 1 if short_mavg > long_mavg else -1
 
         return signal
 
+    def precompute(self, close_matrix: np.ndarray) -> np.ndarray:
+        """
+        Make predictions for every bar at once
+
+        Row t of the result only depends on rows up to and including t, so it
+        matches calling predict() on the history up to that bar.
+
+        :param close_matrix: Close prices with shape (n_days, n_symbols)
+
+        :return: Predictions (-1, 1) with shape (n_days, n_symbols)
+        """
+        # Numba is slow to import, so the kernel is only imported when needed
+        try:
+            from ._bt_kernel import sma_signals
+        except ImportError:
+            from _bt_kernel import sma_signals
+
+        signals = np.empty(close_matrix.shape, dtype=np.int8)
+        sma_signals(close_matrix, self.short_window, self.long_window, signals)
+
+        return signals
+
 
 if __name__ == "__main__":
     # Set up logging
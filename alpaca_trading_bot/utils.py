@@ -1,11 +1,13 @@
 import logging
 import os
 
-import discord_webhook
 from dotenv import load_dotenv
 
 log = logging.getLogger(__name__)
 
+# Maximum number of characters Discord accepts in a single message
+DISCORD_MESSAGE_LIMIT = 2000
+
 
 def send_discord_message(url: str, message: str):
     """
@@ -14,6 +16,8 @@ def send_discord_message(url: str, message: str):
     :param url: Discord webhook URL
     :param message: Message to send
     """
+    import discord_webhook
+
     log.info(f"Connecting to Discord webhook at {url}")
     webhook = discord_webhook.DiscordWebhook(url=url)
 
@@ -29,6 +33,36 @@ def send_discord_message(url: str, message: str):
     return True
 
 
+def send_discord_messages(url: str, messages: list) -> bool:
+    """
+    Send several messages to a Discord webhook in as few requests as possible
+
+    Messages are joined with newlines into payloads of up to
+    DISCORD_MESSAGE_LIMIT characters, a message longer than that is split.
+
+    :param url: Discord webhook URL
+    :param messages: Messages to send
+    :return: True if every payload was sent, False otherwise
+    """
+    payloads = []
+    current = ""
+    for message in messages:
+        for start in range(0, max(len(message), 1), DISCORD_MESSAGE_LIMIT):
+            part = message[start : start + DISCORD_MESSAGE_LIMIT]
+            if current and len(current) + 1 + len(part) <= DISCORD_MESSAGE_LIMIT:
+                current += "\n" + part
+            else:
+                if current:
+                    payloads.append(current)
+                current = part
+    if current:
+        payloads.append(current)
+
+    log.info(f"Sending {len(messages)} messages in {len(payloads)} payloads")
+    results = [send_discord_message(url, payload) for payload in payloads]
+    return all(results)
+
+
 if __name__ == "__main__":
     # Set up logging
     logging.basicConfig(level=logging.INFO)